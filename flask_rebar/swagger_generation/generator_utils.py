@@ -9,9 +9,10 @@
 """
 import copy
 import re
-from collections import namedtuple, OrderedDict
+from collections import namedtuple
 
 from flask_rebar.utils.defaults import USE_DEFAULT
+from flask_rebar.utils.deprecation import deprecated
 from flask_rebar.swagger_generation import swagger_words as sw
 from flask_rebar.swagger_generation.marshmallow_to_swagger import get_swagger_title
 
@@ -267,14 +268,42 @@ def iterate_path_definitions(paths):
         yield from methods.values()
 
 
+def recursively_sort_dict_keys(obj):
+    """Recursively rebuilds all dictionaries in `obj` with their keys sorted.
+
+    Plain dictionaries preserve insertion order, so there's no need for
+    OrderedDicts to produce a consistent output.
+    """
+    if isinstance(obj, dict):
+        return {
+            key: recursively_sort_dict_keys(val) for key, val in sorted(obj.items())
+        }
+    elif isinstance(obj, list):
+        return [recursively_sort_dict_keys(item) for item in obj]
+    else:
+        return obj
+
+
+@deprecated("recursively_sort_dict_keys", "4.0")
 def recursively_convert_dict_to_ordered_dict(obj):
-    """Recursively converts a dictionary into and OrderedDict"""
+    """Recursively sorts all dictionaries in `obj` by key.
+
+    Deprecated alias of `recursively_sort_dict_keys`. Note that this now
+    returns plain (insertion-ordered) dicts rather than OrderedDicts.
+    """
+    return recursively_sort_dict_keys(obj)
+
+
+def recursively_copy_dicts(obj):
+    """Recursively copies all dictionaries and lists in `obj`.
+
+    Unlike `copy.deepcopy`, an object that appears in several places in `obj`
+    is copied separately for each of them, so no two places in the result
+    share an object.
+    """
     if isinstance(obj, dict):
-        sorted_dict = OrderedDict(sorted(obj.items(), key=lambda i: i[0]))
-        for key, val in obj.items():
-            sorted_dict[key] = recursively_convert_dict_to_ordered_dict(val)
-        return sorted_dict
+        return {key: recursively_copy_dicts(val) for key, val in obj.items()}
     elif isinstance(obj, list):
-        return [recursively_convert_dict_to_ordered_dict(item) for item in obj]
+        return [recursively_copy_dicts(item) for item in obj]
     else:
         return obj
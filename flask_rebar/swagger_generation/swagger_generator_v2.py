@@ -16,7 +16,7 @@ from flask_rebar.swagger_generation.generator_utils import (
     verify_parameters_are_the_same,
     get_response_description,
     create_ref,
-    recursively_convert_dict_to_ordered_dict,
+    recursively_sort_dict_keys,
     get_unique_schema_definitions,
     get_ref_schema,
     get_unique_authenticators,
@@ -116,7 +116,7 @@ class SwaggerV2Generator(SwaggerGenerator):
         :param Sequence[str] schemes: Overrides the initialized schemas
         :param Sequence[str] consumes: Overrides the initialized consumes
         :param Sequence[str] produces: Overrides the initialized produces
-        :param bool sort_keys: Use OrderedDicts sorted by keys instead of dicts
+        :param bool sort_keys: Sort all dictionaries in the output by key
         :rtype: dict
         """
 
@@ -171,7 +171,7 @@ class SwaggerV2Generator(SwaggerGenerator):
 
         if sort_keys:
             # Sort the swagger we generated by keys to produce a consistent output.
-            swagger = recursively_convert_dict_to_ordered_dict(swagger)
+            swagger = recursively_sort_dict_keys(swagger)
 
         return swagger
 
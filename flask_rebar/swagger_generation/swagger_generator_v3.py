@@ -7,6 +7,8 @@
     :copyright: Copyright 2019 PlanGrid, Inc., see AUTHORS.
     :license: MIT, see LICENSE for details.
 """
+import itertools
+
 from flask_rebar.utils.defaults import USE_DEFAULT
 from flask_rebar.swagger_generation import swagger_words as sw
 from flask_rebar.swagger_generation.swagger_generator import SwaggerGenerator
@@ -16,7 +18,8 @@ from flask_rebar.swagger_generation.generator_utils import (
     verify_parameters_are_the_same,
     get_response_description,
     get_unique_schema_definitions,
-    recursively_convert_dict_to_ordered_dict,
+    recursively_copy_dicts,
+    recursively_sort_dict_keys,
     get_ref_schema,
     get_unique_authenticators,
 )
@@ -26,6 +29,29 @@ from flask_rebar.swagger_generation.marshmallow_to_swagger import (
 )
 from flask_rebar.validation import Error
 
+# Keys that converters put in a field's JSONSchema, but that belong to the
+# enclosing parameter object in OpenAPI 3.
+_PARAMETER_LEVEL_KEYS = (sw.explode, sw.description, sw.style)
+
+
+class _GenerationCache:
+    """Swagger objects derived while generating a single specification.
+
+    Many endpoints share the same schemas and authenticators, so these are
+    built once per call to `SwaggerV3Generator.generate`. A new cache is
+    created for every call, as the same generator may be used by concurrent
+    requests.
+    """
+
+    def __init__(self):
+        # Keyed by schema instance
+        self.response_definitions = {}
+        self.ref_schemas = {}
+        # Keyed by (schema instance, converter, parameter location)
+        self.parameters = {}
+        # Keyed by authenticator instance
+        self.security_requirements = {}
+
 
 class SwaggerV3Generator(SwaggerGenerator):
     """Generates a v3.1.0 Swagger specification from a Rebar object.
@@ -89,22 +115,25 @@ class SwaggerV3Generator(SwaggerGenerator):
 
         :param flask_rebar.rebar.HandlerRegistry registry:
         :param str host: Adds this host as a Server Object for the service
-        :param bool sort_keys: Use OrderedDicts sorted by keys instead of dicts
+        :param bool sort_keys: Sort all dictionaries in the output by key
         :rtype: dict
         """
 
+        cache = _GenerationCache()
+
         components = self._get_components(registry=registry)
 
         default_security = []
         for authenticator in registry.default_authenticators:
             default_security.extend(
-                self.authenticator_converter.get_security_requirements(authenticator)
+                self._get_security_requirements(authenticator, cache)
             )
 
         paths = self._get_paths(
             paths=registry.paths,
             default_headers_schema=registry.default_headers_schema,
             default_security=default_security,
+            cache=cache,
         )
 
         swagger = {
@@ -129,162 +158,235 @@ class SwaggerV3Generator(SwaggerGenerator):
 
         if sort_keys:
             # Sort the swagger we generated by keys to produce a consistent output.
-            swagger = recursively_convert_dict_to_ordered_dict(swagger)
+            swagger = recursively_sort_dict_keys(swagger)
+        else:
+            # Operations share the swagger objects derived from the same
+            # schemas, so give every part of the output its own copy.
+            swagger = recursively_copy_dicts(swagger)
 
         return swagger
 
-    def _get_paths(self, paths, default_headers_schema, default_security=None):
+    def _get_paths(self, paths, default_headers_schema, cache, default_security=None):
         path_definitions = {}
 
+        # Bind the swagger words used below to locals, as the loops look them
+        # up for every parameter of every operation.
+        _name = sw.name
+        _required = sw.required
+        _in = sw.in_
+        _path = sw.path
+        _style = sw.style
+        _simple = sw.simple
+        _schema = sw.schema
+        _type = sw.type_
+        _parameters = sw.parameters
+        _default = sw.default
+        _description = sw.description
+        _query = sw.query
+        _header = sw.header
+        _content = sw.content
+        _operation_id = sw.operation_id
+        _responses = sw.responses
+        _request_body = sw.request_body
+        _security = sw.security
+        _tags = sw.tags
+        _summary = sw.summary
+
+        # The default response is the same for every operation, and nothing
+        # below mutates it, so all operations can share one definition.
+        default_response_definition = self._get_response_definition(
+            self.default_response_schema, cache
+        )
+        no_response_body_definition = {_description: "No response body."}
+
+        # Path parameters of the same Flask converter type share one
+        # (read-only) schema object.
+        swagger_types = self.flask_converters_to_swagger_types
+        path_arg_schemas = {
+            flask_type: {_type: swagger_type}
+            for flask_type, swagger_type in swagger_types.items()
+        }
+        path_param_signatures = {}
+
         for path, methods in paths.items():
             spec_path, path_args = format_path_for_swagger(path)
 
-            if not self.include_hidden and all(
-                d.hidden for method, d in methods.items()
-            ):
+            if not self.include_hidden:
+                methods = {method: d for method, d in methods.items() if not d.hidden}
+            if not methods:
                 continue
 
             # Different Flask paths might correspond to the same Swagger path
             # because of Flask URL path converters. In this case, let's just
             # work off the same path definitions.
-            if spec_path in path_definitions:
-                path_definition = path_definitions[spec_path]
-            else:
-                path_definitions[spec_path] = path_definition = {}
+            path_definition = path_definitions.setdefault(spec_path, {})
 
             if path_args:
-                path_params = [
-                    {
-                        sw.name: path_arg.name,
-                        sw.required: True,
-                        sw.in_: sw.path,
-                        sw.style: sw.simple,
-                        sw.schema: {
-                            sw.type_: self.flask_converters_to_swagger_types[
-                                path_arg.type
-                            ]
-                        },
-                    }
-                    for path_arg in path_args
-                ]
-
-                # We have to check for an ugly case here. If different Flask
-                # paths that map to the same Swagger path use different URL
-                # converters for the same parameter, we have a problem. Let's
-                # just throw an error in this case.
-                if sw.parameters in path_definition:
-                    verify_parameters_are_the_same(
-                        path_definition[sw.parameters], path_params
+                # Path parameters are fully determined by their names and
+                # Swagger types, which gives us something cheap to compare when
+                # multiple Flask paths map to this Swagger path.
+                signature = tuple(
+                    sorted(
+                        (path_arg.name, swagger_types[path_arg.type])
+                        for path_arg in path_args
                     )
+                )
+                previous_signature = path_param_signatures.get(spec_path)
+
+                if signature != previous_signature:
+                    path_params = [
+                        {
+                            _name: path_arg.name,
+                            _required: True,
+                            _in: _path,
+                            _style: _simple,
+                            _schema: path_arg_schemas[path_arg.type],
+                        }
+                        for path_arg in path_args
+                    ]
+
+                    # We have to check for an ugly case here. If different Flask
+                    # paths that map to the same Swagger path use different URL
+                    # converters for the same parameter, we have a problem. Let's
+                    # just throw an error in this case.
+                    if _parameters in path_definition:
+                        verify_parameters_are_the_same(
+                            path_definition[_parameters], path_params
+                        )
 
-                path_definition[sw.parameters] = path_params
+                    path_definition[_parameters] = path_params
+                    path_param_signatures[spec_path] = signature
 
             for method, d in methods.items():
-                if not self.include_hidden and d.hidden:
-                    continue
-
-                responses_definition = {
-                    sw.default: self._get_response_definition(
-                        self.default_response_schema
-                    )
-                }
-
-                if d.response_body_schema:
-                    for status_code, schema in d.response_body_schema.items():
+                endpoint = d.endpoint
+                func = d.func
+                doc = func.__doc__
+                response_body_schema = d.response_body_schema
+                query_string_schema = d.query_string_schema
+                headers_schema = d.headers_schema
+                request_body_schema = d.request_body_schema
+                authenticators = d.authenticators
+                tags = d.tags
+                summary = d.summary
+
+                responses_definition = {_default: default_response_definition}
+
+                if response_body_schema:
+                    for status_code, schema in response_body_schema.items():
                         if schema is not None:
-                            response_definition = self._get_response_definition(schema)
+                            response_definition = self._get_response_definition(
+                                schema, cache
+                            )
                         else:
-                            response_definition = {sw.description: "No response body."}
+                            response_definition = no_response_body_definition
 
                         responses_definition[str(status_code)] = response_definition
 
-                parameters_definition = []
+                operation = {
+                    _operation_id: endpoint or get_swagger_title(func),
+                    _responses: responses_definition,
+                }
+
+                if doc:
+                    operation[_description] = doc
 
-                if d.query_string_schema:
-                    parameters_definition.extend(
+                query_string_parameters = header_parameters = ()
+
+                if query_string_schema:
+                    query_string_parameters = (
                         self._convert_schema_to_list_of_parameters(
-                            schema=d.query_string_schema,
+                            schema=query_string_schema,
                             converter=self._query_string_converter,
-                            in_=sw.query,
+                            in_=_query,
+                            cache=cache,
                         )
                     )
 
-                if d.headers_schema is USE_DEFAULT:
+                if headers_schema is USE_DEFAULT:
                     headers_schema = default_headers_schema
-                else:
-                    headers_schema = d.headers_schema
 
                 if headers_schema:
-                    parameters_definition.extend(
-                        self._convert_schema_to_list_of_parameters(
-                            schema=headers_schema,
-                            converter=self._headers_converter,
-                            in_=sw.header,
-                        )
+                    header_parameters = self._convert_schema_to_list_of_parameters(
+                        schema=headers_schema,
+                        converter=self._headers_converter,
+                        in_=_header,
+                        cache=cache,
                     )
 
-                request_body = None
-
-                if d.request_body_schema:
-                    schema = d.request_body_schema
-
-                    request_body = {
-                        sw.required: True,
-                        sw.content: {
+                # The converted lists are shared between operations, so each
+                # operation gets its own copy, allocated once at its final size.
+                if query_string_parameters or header_parameters:
+                    operation[_parameters] = [
+                        *query_string_parameters,
+                        *header_parameters,
+                    ]
+
+                if request_body_schema:
+                    operation[_request_body] = {
+                        _required: True,
+                        _content: {
                             "application/json": {
-                                sw.schema: get_ref_schema(self._ref_base, schema)
+                                _schema: self._get_ref_schema(
+                                    request_body_schema, cache
+                                )
                             }
                         },
                     }
 
-                method_lower = method.lower()
-                path_definition[method_lower] = {
-                    sw.operation_id: d.endpoint or get_swagger_title(d.func),
-                    sw.responses: responses_definition,
-                }
-
-                if d.func.__doc__:
-                    path_definition[method_lower][sw.description] = d.func.__doc__
-
-                if parameters_definition:
-                    path_definition[method_lower][sw.parameters] = parameters_definition
-
-                if request_body:
-                    path_definition[method_lower][sw.request_body] = request_body
-
-                if not d.authenticators:
-                    path_definition[method_lower][sw.security] = []
+                if not authenticators:
+                    operation[_security] = []
                 else:
                     non_default = False
-                    security = []
-                    for authenticator in d.authenticators:
+                    security_requirements = []
+                    for authenticator in authenticators:
                         if authenticator is not USE_DEFAULT:
-                            security.extend(
-                                self.authenticator_converter.get_security_requirements(
-                                    authenticator
-                                )
+                            security_requirements.append(
+                                self._get_security_requirements(authenticator, cache)
                             )
                             non_default = True
                         elif default_security is not None:
-                            security.extend(default_security)
+                            security_requirements.append(default_security)
                     if non_default:
-                        path_definition[method_lower][sw.security] = security
+                        operation[_security] = list(
+                            itertools.chain.from_iterable(security_requirements)
+                        )
 
-                if d.tags:
-                    path_definition[method_lower][sw.tags] = d.tags
+                if tags:
+                    operation[_tags] = tags
 
-                if d.summary:
-                    path_definition[method_lower][sw.summary] = d.summary
+                if summary:
+                    operation[_summary] = summary
+
+                path_definition[method.lower()] = operation
 
         return path_definitions
 
-    def _get_response_definition(self, schema):
-        return {
-            sw.description: get_response_description(schema),
-            sw.content: {
-                "application/json": {sw.schema: get_ref_schema(self._ref_base, schema)}
-            },
-        }
+    def _get_response_definition(self, schema, cache):
+        response_definition = cache.response_definitions.get(schema)
+        if response_definition is None:
+            response_definition = {
+                sw.description: get_response_description(schema),
+                sw.content: {
+                    "application/json": {sw.schema: self._get_ref_schema(schema, cache)}
+                },
+            }
+            cache.response_definitions[schema] = response_definition
+        return response_definition
+
+    def _get_ref_schema(self, schema, cache):
+        ref_schema = cache.ref_schemas.get(schema)
+        if ref_schema is None:
+            ref_schema = get_ref_schema(self._ref_base, schema)
+            cache.ref_schemas[schema] = ref_schema
+        return ref_schema
+
+    def _get_security_requirements(self, authenticator, cache):
+        security_requirements = cache.security_requirements.get(authenticator)
+        if security_requirements is None:
+            converter = self.authenticator_converter
+            security_requirements = converter.get_security_requirements(authenticator)
+            cache.security_requirements[authenticator] = security_requirements
+        return security_requirements
 
     def _get_components(self, registry):
         """
@@ -317,7 +419,7 @@ class SwaggerV3Generator(SwaggerGenerator):
 
         return components
 
-    def _convert_schema_to_list_of_parameters(self, schema, converter, in_):
+    def _convert_schema_to_list_of_parameters(self, schema, converter, in_, cache):
         """Swagger is only _based_ on JSONSchema. Query string and header parameters
         are represented as list, not as an object. This converts a JSONSchema
         object (as return by the converters) to a list of parameters suitable for
@@ -325,33 +427,36 @@ class SwaggerV3Generator(SwaggerGenerator):
 
         :param marshmallow.Schema schema:
         :param str in_: 'query' or 'header'
+        :param _GenerationCache cache:
         :rtype: list[dict]
         """
+        # The same query string and headers schemas (e.g. the default headers
+        # schema) tend to be used by many endpoints, so only convert them once.
+        cache_key = (schema, converter, in_)
+        parameters = cache.parameters.get(cache_key)
+        if parameters is not None:
+            return parameters
+
         parameters = []
 
         for prop, field in get_schema_fields(schema):
             jsonschema = converter(field)
 
-            # Pardon the ugliness.
-            # We need the "explode" key to be at the parameters level, not at the schema level.
-            explode = jsonschema.pop(sw.explode, None)
-            description = jsonschema.pop(sw.description, None)
-            style = jsonschema.pop(sw.style, None)
-
             parameter = {
                 sw.name: prop,
                 sw.in_: in_,
                 sw.schema: jsonschema,
-                sw.required: bool(field.required),
+                sw.required: field.required,
             }
 
-            if explode is not None:
-                parameter[sw.explode] = explode
-            if description is not None:
-                parameter[sw.description] = description
-            if style is not None:
-                parameter[sw.style] = style
+            # Pardon the ugliness.
+            # We need these keys to be at the parameters level, not at the schema level.
+            for key in _PARAMETER_LEVEL_KEYS:
+                value = jsonschema.pop(key, None)
+                if value is not None:
+                    parameter[key] = value
 
             parameters.append(parameter)
 
+        cache.parameters[cache_key] = parameters
         return parameters
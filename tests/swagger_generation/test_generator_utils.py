@@ -12,6 +12,11 @@ import unittest
 from flask_rebar.swagger_generation.generator_utils import PathArgument
 from flask_rebar.swagger_generation.generator_utils import flatten
 from flask_rebar.swagger_generation.generator_utils import format_path_for_swagger
+from flask_rebar.swagger_generation.generator_utils import (
+    recursively_convert_dict_to_ordered_dict,
+)
+from flask_rebar.swagger_generation.generator_utils import recursively_copy_dicts
+from flask_rebar.swagger_generation.generator_utils import recursively_sort_dict_keys
 
 
 class TestFlatten(unittest.TestCase):
@@ -210,3 +215,44 @@ class TestFormatPathForSwagger(unittest.TestCase):
 
         self.assertEqual(res, "/health")
         self.assertEqual(args, tuple())
+
+
+class TestRecursivelySortDictKeys(unittest.TestCase):
+    def test_sort_dict_keys(self):
+        input_ = {
+            "b": {"d": 1, "c": [{"f": None, "e": "x"}, 2]},
+            "a": [],
+        }
+
+        result = recursively_sort_dict_keys(input_)
+
+        self.assertEqual(result, input_)
+        self.assertIs(type(result), dict)
+        self.assertEqual(list(result), ["a", "b"])
+        self.assertEqual(list(result["b"]), ["c", "d"])
+        self.assertEqual(list(result["b"]["c"][0]), ["e", "f"])
+
+    def test_deprecated_alias(self):
+        input_ = {"b": 1, "a": {"d": 2, "c": 3}}
+
+        with self.assertWarns(FutureWarning):
+            result = recursively_convert_dict_to_ordered_dict(input_)
+
+        self.assertEqual(result, recursively_sort_dict_keys(input_))
+        self.assertEqual(list(result), ["a", "b"])
+        self.assertEqual(list(result["a"]), ["c", "d"])
+
+
+class TestRecursivelyCopyDicts(unittest.TestCase):
+    def test_copy_dicts(self):
+        shared = {"b": 1, "a": [{"c": None}]}
+        input_ = {"y": shared, "x": [shared]}
+
+        result = recursively_copy_dicts(input_)
+
+        self.assertEqual(result, input_)
+        self.assertEqual(list(result), ["y", "x"])
+        self.assertEqual(list(result["y"]), ["b", "a"])
+        self.assertIsNot(result["y"], shared)
+        self.assertIsNot(result["y"], result["x"][0])
+        self.assertIsNot(result["y"]["a"][0], result["x"][0]["a"][0])
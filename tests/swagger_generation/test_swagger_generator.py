@@ -7,7 +7,10 @@
     :copyright: Copyright 2018 PlanGrid, Inc., see AUTHORS.
     :license: MIT, see LICENSE for details.
 """
+import gc
 import json
+import weakref
+from http import HTTPStatus
 
 import marshmallow as m
 import pytest
@@ -216,6 +219,188 @@ def test_path_parameter_types_must_be_the_same_for_same_path(generator):
         generator.generate(registry)
 
 
+@pytest.mark.parametrize("generator", [SwaggerV2Generator(), SwaggerV3Generator()])
+def test_path_parameter_types_may_differ_if_swagger_types_are_the_same(generator):
+    rebar = Rebar()
+    registry = rebar.create_handler_registry()
+
+    @registry.handles(rule="/foos/<string:foo_uid>", method="GET")
+    def get_foo(foo_uid):
+        pass
+
+    @registry.handles(rule="/foos/<uuid:foo_uid>", method="PATCH")
+    def update_foo(foo_uid):
+        pass
+
+    swagger = generator.generate(registry)
+
+    path = swagger["paths"]["/foos/{foo_uid}"]
+    assert set(path) == {"parameters", "get", "patch"}
+    assert [parameter["name"] for parameter in path["parameters"]] == ["foo_uid"]
+
+
+class _QueryStringSchema(m.Schema):
+    page = m.fields.Integer()
+
+
+class _HeadersSchema(m.Schema):
+    x_tenant = m.fields.String(data_key="X-Tenant", required=True)
+
+
+def _get_parameters(swagger, path, method):
+    return [
+        (parameter["name"], parameter["in"], parameter["required"])
+        for parameter in swagger["paths"][path][method].get("parameters", [])
+    ]
+
+
+@pytest.mark.parametrize("generator", [SwaggerV2Generator(), SwaggerV3Generator()])
+def test_endpoints_sharing_schemas_get_all_parameters(generator):
+    rebar = Rebar()
+    registry = rebar.create_handler_registry(default_headers_schema=_HeadersSchema())
+    query_string_schema = _QueryStringSchema()
+
+    @registry.handles(
+        rule="/foos", method="GET", query_string_schema=query_string_schema
+    )
+    def list_foos():
+        pass
+
+    @registry.handles(
+        rule="/bars", method="GET", query_string_schema=query_string_schema
+    )
+    def list_bars():
+        pass
+
+    @registry.handles(rule="/bazs", method="GET")
+    def list_bazs():
+        pass
+
+    swagger = generator.generate(registry)
+
+    expected_parameters = [("page", "query", False), ("X-Tenant", "header", True)]
+    assert _get_parameters(swagger, "/foos", "get") == expected_parameters
+    assert _get_parameters(swagger, "/bars", "get") == expected_parameters
+    assert _get_parameters(swagger, "/bazs", "get") == [("X-Tenant", "header", True)]
+
+
+@pytest.mark.parametrize("generator", [SwaggerV2Generator(), SwaggerV3Generator()])
+def test_generator_can_be_reused_for_different_registries(generator):
+    class CursorSchema(m.Schema):
+        cursor = m.fields.String()
+
+    rebar = Rebar()
+    registry = rebar.create_handler_registry(default_headers_schema=_HeadersSchema())
+    other_registry = rebar.create_handler_registry()
+
+    @registry.handles(
+        rule="/foos", method="GET", query_string_schema=_QueryStringSchema()
+    )
+    def list_foos():
+        pass
+
+    @other_registry.handles(
+        rule="/foos",
+        method="GET",
+        query_string_schema=CursorSchema(),
+        response_body_schema=CursorSchema(),
+    )
+    def list_other_foos():
+        pass
+
+    swagger = generator.generate(registry)
+    other_swagger = generator.generate(other_registry)
+
+    assert _get_parameters(swagger, "/foos", "get") == [
+        ("page", "query", False),
+        ("X-Tenant", "header", True),
+    ]
+    assert _get_parameters(other_swagger, "/foos", "get") == [
+        ("cursor", "query", False)
+    ]
+    _assert_dicts_equal(other_swagger, type(generator)().generate(other_registry))
+
+
+@pytest.mark.parametrize("generator", [SwaggerV2Generator(), SwaggerV3Generator()])
+def test_response_status_codes_are_rendered_with_str(generator):
+    rebar = Rebar()
+    registry = rebar.create_handler_registry()
+
+    @registry.handles(
+        rule="/foos",
+        method="POST",
+        response_body_schema={201: _QueryStringSchema(), HTTPStatus.ACCEPTED: None},
+    )
+    def create_foo():
+        pass
+
+    swagger = generator.generate(registry)
+
+    responses = swagger["paths"]["/foos"]["post"]["responses"]
+    assert set(responses) == {"default", "201", str(HTTPStatus.ACCEPTED)}
+
+
+@pytest.mark.parametrize("sort_keys", [True, False])
+def test_swagger_v3_generator_operations_do_not_share_objects(sort_keys):
+    rebar = Rebar()
+    registry = rebar.create_handler_registry(default_headers_schema=_HeadersSchema())
+    schema = _QueryStringSchema()
+
+    @registry.handles(
+        rule="/foos",
+        method="GET",
+        query_string_schema=schema,
+        response_body_schema=schema,
+    )
+    def list_foos():
+        pass
+
+    @registry.handles(
+        rule="/bars",
+        method="GET",
+        query_string_schema=schema,
+        response_body_schema=schema,
+    )
+    def list_bars():
+        pass
+
+    swagger = SwaggerV3Generator().generate(registry, sort_keys=sort_keys)
+
+    foos = swagger["paths"]["/foos"]["get"]
+    bars = swagger["paths"]["/bars"]["get"]
+    assert foos == {**bars, "operationId": "list_foos"}
+    assert foos["responses"]["200"] is not bars["responses"]["200"]
+    assert foos["responses"]["default"] is not bars["responses"]["default"]
+
+    foos["parameters"][0]["required"] = True
+    assert bars["parameters"][0]["required"] is False
+
+
+def test_swagger_v3_generator_does_not_keep_references_to_registry():
+    class FooSchema(m.Schema):
+        name = m.fields.String()
+
+    generator = SwaggerV3Generator()
+    response_body_schema = FooSchema()
+    schema_ref = weakref.ref(response_body_schema)
+
+    rebar = Rebar()
+    registry = rebar.create_handler_registry()
+
+    @registry.handles(
+        rule="/foos", method="GET", response_body_schema=response_body_schema
+    )
+    def list_foos():
+        pass
+
+    generator.generate(registry)
+
+    del rebar, registry, list_foos, response_body_schema
+    gc.collect()
+
+    assert schema_ref() is None
+
+
 @pytest.mark.parametrize(
     "registry, swagger_generator, expected_swagger",
     [